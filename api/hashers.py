@@ -0,0 +1,7 @@
+from django.contrib.auth import hashers
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    time_cost = 2
+    memory_cost = 19456
+    parallelism = 1
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.11 on 2026-10-15 08:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_product_featured_alter_image_url_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['is_available'], name='api_product_is_avai_346be6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['is_active'], name='api_user_is_acti_ed52c0_idx'),
+        ),
+    ]
@@ -46,6 +46,9 @@ class User(AbstractUser):
 
     objects = CustomUserManager()
 
+    class Meta(AbstractUser.Meta):
+        indexes = [models.Index(fields=["is_active"])]
+
     def __str__(self):
         return self.email
 
@@ -78,6 +81,9 @@ class Product(models.Model):
     stars = models.IntegerField(default=0)
     reviews = models.IntegerField(default=0)
 
+    class Meta:
+        indexes = [models.Index(fields=["is_available"])]
+
     def __str__(self):
         return "{} ({} NGN)".format(self.name, self.price/100)
 
@@ -12,6 +12,14 @@ class IsUser(permissions.BasePermission):
         return bool(request.user)
 
 
+class IsUserOrAdmin(IsUser):
+
+    def has_object_permission(self, request, view, obj):
+        return bool(
+            request.user.is_staff or super().has_object_permission(request, view, obj)
+        )
+
+
 class IsVendor(permissions.BasePermission):
 
     def has_permission(self, request, view):
@@ -19,7 +27,7 @@ class IsVendor(permissions.BasePermission):
 
     def has_object_permission(self, request, view, obj):
         item = obj.product if hasattr(obj, "product") else obj
-        return bool(request.user == item.vendor.user)
+        return bool(request.user.pk == item.vendor.user_id)
 
 
 class IsAVendor(permissions.BasePermission):
@@ -36,10 +44,11 @@ class CanReview(permissions.BasePermission):
         if view.action == "create":
             product_id = request.data.get("product", None)
             if product_id:
-                product = Product.objects.get(id=int(product_id))
                 return bool(
                     request.user
                     and request.user.is_authenticated
-                    and request.user in product.customers.all()
+                    and Product.objects.filter(
+                        id=int(product_id), customers=request.user
+                    ).exists()
                 )
         return request.user and request.user.is_authenticated
@@ -1,9 +1,14 @@
+import copy
+from functools import lru_cache
+from operator import attrgetter
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.relations import MANY_RELATION_KWARGS, ManyRelatedField
 from rest_framework.serializers import (
     ModelSerializer,
     PrimaryKeyRelatedField,
     RelatedField,
     ReadOnlyField,
-    StringRelatedField,
     SerializerMethodField,
     ValidationError,
 )
@@ -21,50 +26,156 @@ from .models import (
 )
 
 
+@lru_cache(maxsize=None)
+def compile_flat_serializer(model, fields=None):
+    concrete_fields = model._meta.concrete_fields
+    if fields is not None:
+        unknown = set(fields) - {field.name for field in concrete_fields}
+        if unknown:
+            raise ImproperlyConfigured(
+                "{} has no concrete field(s) named {}.".format(
+                    model.__name__, ", ".join(sorted(unknown))
+                )
+            )
+
+    model_fields = [
+        field
+        for field in concrete_fields
+        if fields is None or field.name in fields
+    ]
+    names = tuple(field.name for field in model_fields)
+    if not names:
+        return lambda obj: {}
+    getter = attrgetter(*(field.attname for field in model_fields))
+    if len(names) == 1:
+        return lambda obj: {names[0]: getter(obj)}
+    return lambda obj: dict(zip(names, getter(obj)))
+
+
+class DynamicModelSerializer(ModelSerializer):
+    CUSTOM_FIELDS = None
+    _fields_cache = {}
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop("fields", None)
+        self.dynamic_fields = None if fields is None else frozenset(fields)
+        super().__init__(*args, **kwargs)
+
+    def get_field_names(self, declared_fields, info):
+        field_names = super().get_field_names(declared_fields, info)
+        if self.dynamic_fields is None:
+            return field_names
+        return tuple(x for x in field_names if x in self.dynamic_fields)
+
+    def get_fields(self):
+        key = (type(self), self.dynamic_fields)
+        if key not in self._fields_cache:
+            self._fields_cache[key] = super().get_fields()
+        # Fields get bound to their parent serializer, so every instance
+        # needs its own copies of the cached, unbound ones.
+        return copy.deepcopy(self._fields_cache[key])
+
+
 class CustomRelatedField(RelatedField):
 
     def __init__(self, **kwargs):
         self.serializer = kwargs.pop("serializer", None)
-        self.display_fields = kwargs.pop("display_fields", None)
+        display_fields = kwargs.pop(
+            "display_fields", getattr(self.serializer, "CUSTOM_FIELDS", None)
+        )
+        self.display_fields = (
+            None if display_fields is None else frozenset(display_fields)
+        )
+        self.flat_serializer = None
+        if kwargs.pop("flat", False):
+            self.flat_serializer = compile_flat_serializer(
+                self.serializer.Meta.model, self.display_fields
+            )
         super().__init__(**kwargs)
 
     def to_internal_value(self, data):
         return self.queryset.get(pk=data)
 
     def to_representation(self, value):
-        return self.serializer(instance=value).data
+        if self.flat_serializer is not None:
+            return self.flat_serializer(value)
+        return self.serializer(instance=value, fields=self.display_fields).data
 
 
-class ImageSerializer(ModelSerializer):
+class BulkManyRelatedField(ManyRelatedField):
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, "__iter__"):
+            self.fail("not_a_list", input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail("empty")
+
+        child = self.child_relation
+        queryset = child.get_queryset()
+        model_pk = queryset.model._meta.pk
+        values = []
+        pks = []
+        for item in data:
+            if child.pk_field is not None:
+                item = child.pk_field.to_internal_value(item)
+            try:
+                if isinstance(item, bool):
+                    raise TypeError
+                pks.append(model_pk.get_prep_value(item))
+            except (TypeError, ValueError):
+                child.fail("incorrect_type", data_type=type(item).__name__)
+            values.append(item)
+
+        objects = queryset.in_bulk(pks)
+        for value, pk in zip(values, pks):
+            if pk not in objects:
+                child.fail("does_not_exist", pk_value=value)
+        return [objects[pk] for pk in pks]
+
+
+class BulkPrimaryKeyRelatedField(PrimaryKeyRelatedField):
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {"child_relation": cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BulkManyRelatedField(**list_kwargs)
+
+
+class ImageSerializer(DynamicModelSerializer):
 
     class Meta:
         model = Image
         fields = "__all__"
 
 
-class CategorySerializer(ModelSerializer):
+class CategorySerializer(DynamicModelSerializer):
+    CUSTOM_FIELDS = frozenset(("id", "name", "parent"))
+
     class Meta:
         model = Category
         fields = "__all__"
 
 
-class SizeSerializer(ModelSerializer):
+class SizeSerializer(DynamicModelSerializer):
 
     class Meta:
         model = Size
         fields = "__all__"
 
 
-class VendorSerializer(ModelSerializer):
-    user = ReadOnlyField(source="user.id")
+class VendorSerializer(DynamicModelSerializer):
+    user = ReadOnlyField(source="user_id")
 
     class Meta:
         model = Vendor
         fields = "__all__"
 
 
-class ReviewSerializer(ModelSerializer):
-    user = ReadOnlyField(source="user.id")
+class ReviewSerializer(DynamicModelSerializer):
+    user = ReadOnlyField(source="user_id")
 
     class Meta:
         model = Review
@@ -101,8 +212,8 @@ class ReviewSerializer(ModelSerializer):
         return super().update(instance, validated_data)
 
 
-class UserSerializer(ModelSerializer):
-    auth_token = StringRelatedField()
+class UserSerializer(DynamicModelSerializer):
+    auth_token = ReadOnlyField(source="auth_token.key")
 
     class Meta:
         model = User
@@ -116,14 +227,16 @@ class UserSerializer(ModelSerializer):
         }
 
 
-class ProductSerializer(ModelSerializer):
+class ProductSerializer(DynamicModelSerializer):
 
     images = CustomRelatedField(many=True, serializer=ImageSerializer, read_only=True)
-    sizes = CustomRelatedField(many=True, serializer=SizeSerializer, read_only=True)
+    sizes = CustomRelatedField(
+        many=True, serializer=SizeSerializer, read_only=True, flat=True
+    )
     category = CustomRelatedField(
-        queryset=Category.objects.all(), serializer=CategorySerializer
+        queryset=Category.objects.all(), serializer=CategorySerializer, flat=True
     )
-    customers = PrimaryKeyRelatedField(
+    customers = BulkPrimaryKeyRelatedField(
         queryset=User.objects.all(), many=True, required=False
     )
     vendor = CustomRelatedField(
@@ -142,8 +255,8 @@ class ProductSerializer(ModelSerializer):
         }
 
 
-class OrderItemSerializer(ModelSerializer):
-    user = ReadOnlyField(source="user.id")
+class OrderItemSerializer(DynamicModelSerializer):
+    user = ReadOnlyField(source="user_id")
     product = PrimaryKeyRelatedField(queryset=Product.objects.all())
 
     class Meta:
@@ -155,11 +268,9 @@ class OrderItemSerializer(ModelSerializer):
         product = validated_data["product"]
         quantity = validated_data["quantity"]
         user = validated_data["user"]
-        instance = None
 
-        items = OrderItem.objects.filter(product=product, user=user)
-        if items.exists():
-            instance = items.first()
+        instance = OrderItem.objects.filter(product=product, user=user).first()
+        if instance:
             quantity = instance.quantity + quantity
 
         if quantity > product.quantity:
@@ -178,13 +289,13 @@ class OrderItemSerializer(ModelSerializer):
 
         if quantity and quantity > instance.product.quantity:
             raise ValidationError(
-                {"quantity": [f"Product has only {product.quantity} units available."]}
+                {"quantity": [f"Product has only {instance.product.quantity} units available."]}
             )
         return super().update(instance, validated_data)
 
 
-class OrderSerializer(ModelSerializer):
-    user = ReadOnlyField(source="user.id")
+class OrderSerializer(DynamicModelSerializer):
+    user = ReadOnlyField(source="user_id")
     items = OrderItemSerializer(read_only=True, many=True)
 
     class Meta:
@@ -193,10 +304,10 @@ class OrderSerializer(ModelSerializer):
 
     def create(self, validated_data):
         user = validated_data["user"]
-        items = user.items.all()
+        items = list(user.items.values_list("pk", flat=True))
 
-        if not items.exists():
+        if not items:
             raise ValidationError({"items": ["User's cart is empty!"]})
         order = super().create(validated_data)
-        order.items.add(*user.items.all())
+        order.items.add(*items)
         return order
@@ -1,4 +1,5 @@
 from django.contrib.auth.hashers import make_password
+from django.db.models import Prefetch
 from rest_framework import permissions, status
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
@@ -22,6 +23,7 @@ from api.permissions import (
     IsVendor,
     IsAVendor,
     IsUser,
+    IsUserOrAdmin,
 )
 
 from api.serializers import (
@@ -56,8 +58,23 @@ def get_parent(query_params, queryset):
             }
         )
 
-class UserViewSet(ModelViewSet):
-    queryset = User.objects.filter(is_active=True)
+class ActionPermissionsViewSet(ModelViewSet):
+    action_permissions = {}
+    default_permissions = ()
+    unauthenticated_actions = ()
+
+    def initialize_request(self, request, *args, **kwargs):
+        request = super().initialize_request(request, *args, **kwargs)
+        if self.action in self.unauthenticated_actions:
+            request.authenticators = ()
+        return request
+
+    def get_permissions(self):
+        return self.action_permissions.get(self.action, self.default_permissions)
+
+
+class UserViewSet(ActionPermissionsViewSet):
+    queryset = User.objects.filter(is_active=True).select_related("auth_token")
     serializer_class = UserSerializer
     filterset_fields = [
         "id",
@@ -69,43 +86,42 @@ class UserViewSet(ModelViewSet):
     ]
     ordering_fields = ["datetime_created", "first_name", "last_name", "email"]
 
+    action_permissions = {
+        "create": (permissions.AllowAny(),),
+        "retrieve": (IsUserOrAdmin(),),
+        "list": (permissions.IsAdminUser(),),
+    }
+    default_permissions = (IsUser(),)
+
     def destroy(self, request, pk=None, *args, **kwargs):
         user = self.get_object()
-        user.is_active = False
-        user.save()
+        User.objects.filter(pk=user.pk).update(is_active=False)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     def perform_create(self, serializer):
         serializer.save(password=make_password(serializer.validated_data["password"]))
 
-    def get_permissions(self):
-        if self.action == "create":
-            return (permissions.AllowAny(),)
-
-        if self.action == "retrieve":
-            return (permissions.OR(IsUser(), permissions.IsAdminUser()),)
 
-        if self.action == "list":
-            return (permissions.IsAdminUser(),)
-        return (IsUser(),)
-
-
-class ProductViewSet(ModelViewSet):
-    queryset = Product.objects.filter(is_available=True)
+class ProductViewSet(ActionPermissionsViewSet):
+    queryset = (
+        Product.objects.filter(is_available=True)
+        .select_related("vendor", "category")
+        .prefetch_related(
+            "images", "sizes", Prefetch("customers", queryset=User.objects.only("id"))
+        )
+    )
     serializer_class = ProductSerializer
     filterset_fields = ["id", "name", "category", "vendor", "is_available", "price", "featured"]
     ordering_fields = ["datetime_created", "name", "reviews", "stars"]
 
-    def get_permissions(self):
-        if self.action == "create":
-            return (IsAVendor(),)
-
-        if self.action in ("list", "retrieve"):
-            return (permissions.AllowAny(),)
-
-        if self.action == "destroy":
-            return (permissions.OR(IsVendor(), permissions.IsAdminUser()),)
-        return (IsVendor(),)
+    action_permissions = {
+        "create": (IsAVendor(),),
+        "list": (permissions.AllowAny(),),
+        "retrieve": (permissions.AllowAny(),),
+        "destroy": (permissions.OR(IsVendor(), permissions.IsAdminUser()),),
+    }
+    default_permissions = (IsVendor(),)
+    unauthenticated_actions = ("list", "retrieve")
 
     def filter_queryset(self, queryset):
         price_lte = self.request.query_params.get("price_lte", None)
@@ -134,106 +150,114 @@ class ProductViewSet(ModelViewSet):
         return super().filter_queryset(get_parent(self.request.query_params, queryset))
 
 
-class SizeViewSet(ModelViewSet):
+class SizeViewSet(ActionPermissionsViewSet):
     queryset = Size.objects.all()
     serializer_class = SizeSerializer
     filterset_fields = ["id", "name", "product"]
 
-    def get_permissions(self):
-        if self.action in ("list", "retrieve"):
-            return (permissions.AllowAny(),)
-        return (IsVendor(),)
+    action_permissions = {
+        "list": (permissions.AllowAny(),),
+        "retrieve": (permissions.AllowAny(),),
+    }
+    default_permissions = (IsVendor(),)
+    unauthenticated_actions = ("list", "retrieve")
 
 
-class ImageViewSet(ModelViewSet):
+class ImageViewSet(ActionPermissionsViewSet):
 
     queryset = Image.objects.all()
     serializer_class = ImageSerializer
     filterset_fields = ["id", "product"]
 
-    def get_permissions(self):
-        if self.action in ("list", "retrieve"):
-            return (permissions.AllowAny(),)
-
-        if self.action == "destroy":
-            return (permissions.OR(IsVendor(), permissions.IsAdminUser()),)
-        return (IsVendor(),)
+    action_permissions = {
+        "list": (permissions.AllowAny(),),
+        "retrieve": (permissions.AllowAny(),),
+        "destroy": (permissions.OR(IsVendor(), permissions.IsAdminUser()),),
+    }
+    default_permissions = (IsVendor(),)
+    unauthenticated_actions = ("list", "retrieve")
 
 
-class CategoryViewSet(ModelViewSet):
+class CategoryViewSet(ActionPermissionsViewSet):
 
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     filterset_fields = ["id", "name"]
     ordering_fields = ["name"]
 
-    def get_permissions(self):
-        if self.action in ("list", "retrieve"):
-            return (permissions.AllowAny(),)
-        return (permissions.IsAdminUser(),)
+    action_permissions = {
+        "list": (permissions.AllowAny(),),
+        "retrieve": (permissions.AllowAny(),),
+    }
+    default_permissions = (permissions.IsAdminUser(),)
+    unauthenticated_actions = ("list", "retrieve")
 
     def filter_queryset(self, queryset):
         return super().filter_queryset(get_parent(self.request.query_params, queryset))
 
 
-class VendorViewSet(ModelViewSet):
+class VendorViewSet(ActionPermissionsViewSet):
     queryset = Vendor.objects.all()
     serializer_class = VendorSerializer
     filterset_fields = ["id", "name", "user"]
     ordering_fields = ["datetime_created", "name"]
 
+    action_permissions = {
+        "list": (permissions.AllowAny(),),
+        "retrieve": (permissions.AllowAny(),),
+        "create": (permissions.IsAuthenticated(),),
+    }
+    default_permissions = (IsUserOrAdmin(),)
+    unauthenticated_actions = ("list", "retrieve")
+
     def perform_create(self, serializer):
         user = self.request.user
         serializer.save(user=user)
         if not user.is_vendor:
+            User.objects.filter(pk=user.pk, is_vendor=False).update(is_vendor=True)
             user.is_vendor = True
-            user.save()
-
-    def get_permissions(self):
-        if self.action in ("list", "retrieve"):
-            return (permissions.AllowAny(),)
-        elif self.action == "create":
-            return (permissions.IsAuthenticated(),)
-        return (permissions.OR(IsUser(), permissions.IsAdminUser()),)
 
 
-class OrderItemViewSet(ModelViewSet):
+class OrderItemViewSet(ActionPermissionsViewSet):
     serializer_class = OrderItemSerializer
     queryset = OrderItem.objects.all()
     filterset_fields = ["id", "user", "product"]
 
+    default_permissions = (IsUserOrAdmin(),)
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
-    def get_permissions(self):
-        return (permissions.OR(permissions.IsAdminUser(), IsUser()),)
 
-
-class ReviewViewSet(ModelViewSet):
+class ReviewViewSet(ActionPermissionsViewSet):
     queryset = Review.objects.all()
     serializer_class = ReviewSerializer
     filterset_fields = ["id", "stars", "user", "product"]
     ordering_fields = ["datetime_created", "stars"]
 
+    action_permissions = {
+        "list": (permissions.AllowAny(),),
+        "retrieve": (permissions.AllowAny(),),
+        "create": (permissions.OR(CanReview(), permissions.IsAdminUser()),),
+    }
+    default_permissions = (IsUserOrAdmin(),)
+    unauthenticated_actions = ("list", "retrieve")
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
-    def get_permissions(self):
-        if self.action in ("list", "retrieve"):
-            return (permissions.AllowAny(),)
-
-        if self.action == "create":
-            return (permissions.OR(CanReview(), permissions.IsAdminUser()),)
-        return (permissions.OR(IsUser(), permissions.IsAdminUser()),)
-
 
-class OrderViewSet(ModelViewSet):
+class OrderViewSet(ActionPermissionsViewSet):
     serializer_class = OrderSerializer
-    queryset = Order.objects.all()
+    queryset = Order.objects.prefetch_related("items")
     filterset_fields = ["id", "user", "completed"]
     ordering_fields = ["datetime_created"]
 
+    action_permissions = {
+        "create": (permissions.IsAuthenticated(),),
+    }
+    default_permissions = (IsUserOrAdmin(),)
+
     def update(self, request, *args, **kwargs):
         return Response(
             {"detail": 'Method "PUT" not allowed.'},
@@ -248,8 +272,3 @@ class OrderViewSet(ModelViewSet):
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
-
-    def get_permissions(self):
-        if self.action == "create":
-            return (permissions.IsAuthenticated(),)
-        return (permissions.OR(IsUser(), permissions.IsAdminUser()),)